@@ -1,8 +1,11 @@
 #!/usr/bin/env python3
+import contextlib
+import os
 import sys
 import json
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Iterable, List, Optional, Tuple
+from typing import Optional, Tuple
 
 import cv2
 import numpy as np
@@ -69,13 +72,45 @@ MARKER_COLOUR_RULES: Tuple[ColourRule, ...] = (
 MIN_AREA_FACTOR = 0.00012
 MAX_AREA_FACTOR = 0.035
 
+# Grayscale level used when the colour mask finds nothing and we fall back to
+# picking out bright markers directly.
+BRIGHT_FALLBACK_THRESHOLD = 240
+
+# Border statistics that mark an image as already cropped to the paper, letting
+# preprocessing skip the corner search: nearly every border pixel must match the
+# target_beige rule, with a uniform HSV value channel.
+PREWARPED_BORDER_PX = 10
+PREWARPED_MIN_BEIGE_FRACTION = 0.95
+PREWARPED_MAX_BORDER_VAR = 500.0
+
+# Route preprocessing through OpenCL (via cv2.UMat) only when a device exists;
+# otherwise plain ndarrays avoid the upload/download round trip.
+USE_OPENCL = cv2.ocl.haveOpenCL()
+
+# The Node server links uploads/debug/<name>_debug.jpg to the saved target, so
+# the debug render stays on by default; SHOTS_DEBUG=0 skips it entirely for
+# deployments that never serve it.
+SAVE_DEBUG_IMAGE = os.environ.get("SHOTS_DEBUG", "1") != "0"
+
+# Longest side of the saved debug image; drawing happens at this size.
+DEBUG_IMAGE_MAX_DIM = 1200
+
+# Single background worker for debug image writes; main() waits for it
+# before the process exits.
+DEBUG_IMAGE_EXECUTOR = ThreadPoolExecutor(max_workers=1)
+
+# Structuring element for the marker mask closing.
+MASK_CLEANUP_KERNEL = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
+
+# Target beige paper (and most wooden benches) cluster in this range.
+TARGET_BEIGE = ColourRule(
+    name="target_beige",
+    hsv_lower=(10, 20, 80),
+    hsv_upper=(35, 160, 230),
+)
+
 BACKGROUND_SWATCHES: Tuple[ColourRule, ...] = (
-    # Target beige paper (and most wooden benches) cluster in this range.
-    ColourRule(
-        name="target_beige",
-        hsv_lower=(10, 20, 80),
-        hsv_upper=(35, 160, 230),
-    ),
+    TARGET_BEIGE,
     # Very dark cloth/leather benches shouldn't register as markers either.
     ColourRule(
         name="dark_tabletop",
@@ -84,6 +119,53 @@ BACKGROUND_SWATCHES: Tuple[ColourRule, ...] = (
     ),
 )
 
+
+def build_rule_luts(
+    marker_rules: Tuple[ColourRule, ...], background_rules: Tuple[ColourRule, ...]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Precompute lookup tables that classify an HSV pixel against every rule.
+
+    Each rule owns one bit. The first table maps a channel value to the bits of
+    the rules whose range contains it, so a pixel's matching rules are the AND
+    of its three looked-up bytes. The second maps that byte to 255 when a
+    marker rule matched and no background rule did.
+    """
+    rules = marker_rules + background_rules
+    if len(rules) > 8:
+        raise ValueError("HSV rule lookup tables hold at most 8 colour rules")
+
+    channel_lut = np.zeros((1, 256, 3), dtype=np.uint8)
+    for bit, rule in enumerate(rules):
+        for channel in range(3):
+            channel_lut[0, rule.hsv_lower[channel] : rule.hsv_upper[channel] + 1, channel] |= 1 << bit
+
+    marker_bits = (1 << len(marker_rules)) - 1
+    background_bits = ((1 << len(rules)) - 1) & ~marker_bits
+    classify_lut = np.array(
+        [255 if bits & marker_bits and not bits & background_bits else 0 for bits in range(256)],
+        dtype=np.uint8,
+    )
+    return channel_lut, classify_lut
+
+
+HSV_RULE_BITS_LUT, RULE_BITS_TO_MASK_LUT = build_rule_luts(MARKER_COLOUR_RULES, BACKGROUND_SWATCHES)
+
+# Shot records flow through detection and scoring as structured arrays and are
+# only turned into dicts when the JSON output is built.
+SHOT_CANDIDATE_DTYPE = np.dtype(
+    [("x_px", np.float64), ("y_px", np.float64), ("contour_radius", np.float64)]
+)
+SCORED_SHOT_DTYPE = np.dtype(
+    [
+        ("x_px", np.float64),
+        ("y_px", np.float64),
+        ("x_norm", np.float64),
+        ("y_norm", np.float64),
+        ("r_mm", np.float64),
+        ("score", np.float64),
+    ]
+)
+
 # ISSF 10m air pistol scoring ring radii in millimetres.
 ISSF_AIR_PISTOL_RING_RADII_MM = {
     10: 5.75,
@@ -99,14 +181,15 @@ ISSF_AIR_PISTOL_RING_RADII_MM = {
 }
 MAX_RADIUS_MM = ISSF_AIR_PISTOL_RING_RADII_MM[1]
 
-
-def stack_masks(masks: Iterable[np.ndarray]) -> np.ndarray:
-    mask = None
-    for m in masks:
-        mask = m if mask is None else cv2.bitwise_or(mask, m)
-    if mask is None:
-        mask = np.zeros((1, 1), dtype=np.uint8)
-    return mask
+# Ring radii in ascending order (10-ring first) with the matching scores, so a
+# whole batch of shot radii can be resolved with one np.searchsorted call. The
+# trailing 0.0 is the score for anything outside the 1-ring.
+RING_RADII_ASC = np.array(
+    [ISSF_AIR_PISTOL_RING_RADII_MM[score] for score in range(10, 0, -1)], dtype=np.float64
+)
+RING_SCORES = np.array([float(score) for score in range(10, 0, -1)] + [0.0], dtype=np.float64)
+RING_RADII_ASC.setflags(write=False)
+RING_SCORES.setflags(write=False)
 
 
 def load_image(path: str) -> np.ndarray:
@@ -127,6 +210,22 @@ def resize_if_needed(img: np.ndarray, max_dim: int = 1600) -> np.ndarray:
     return cv2.resize(img, (new_w, new_h))
 
 
+def to_host(img):
+    """Download a cv2.UMat back to a NumPy array; pass ndarrays through."""
+    return img.get() if isinstance(img, cv2.UMat) else img
+
+
+@contextlib.contextmanager
+def opencv_threads(count: int):
+    """Temporarily cap OpenCV's internal thread pool, restoring it on exit."""
+    previous = cv2.getNumThreads()
+    cv2.setNumThreads(max(1, count))
+    try:
+        yield
+    finally:
+        cv2.setNumThreads(previous)
+
+
 def order_corners(corners: np.ndarray) -> np.ndarray:
     """Return corners ordered as TL, TR, BR, BL."""
     rect = np.zeros((4, 2), dtype="float32")
@@ -145,7 +244,9 @@ def find_paper_corners(image: np.ndarray) -> Optional[np.ndarray]:
     blur = cv2.GaussianBlur(gray, (5, 5), 0)
     edges = cv2.Canny(blur, 50, 150)
 
-    contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    # Contours traced from a UMat come back as UMats too; trace on the host so
+    # the corner geometry below keeps working with ndarrays.
+    contours, _ = cv2.findContours(to_host(edges), cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
     if not contours:
         return None
 
@@ -158,6 +259,34 @@ def find_paper_corners(image: np.ndarray) -> Optional[np.ndarray]:
     return None
 
 
+def looks_prewarped(img: np.ndarray) -> bool:
+    """True when the image border is uniform target-beige paper.
+
+    A photo that still needs rectifying shows the bench/table around the
+    target; an already cropped target is paper all the way to the edge.
+    """
+    b = PREWARPED_BORDER_PX
+    beige_low = np.array(TARGET_BEIGE.hsv_lower, dtype=np.uint8)
+    beige_high = np.array(TARGET_BEIGE.hsv_upper, dtype=np.uint8)
+    # Accumulate the statistics strip by strip on views of the image rather
+    # than concatenating the border into a new buffer.
+    count = 0
+    beige = 0
+    total = 0.0
+    total_sq = 0.0
+    for strip in (img[:b, :], img[-b:, :], img[:, :b], img[:, -b:]):
+        hsv = cv2.cvtColor(strip, cv2.COLOR_BGR2HSV)
+        beige += cv2.countNonZero(cv2.inRange(hsv, beige_low, beige_high))
+        mean, std = cv2.meanStdDev(cv2.extractChannel(hsv, 2))
+        n = strip.shape[0] * strip.shape[1]
+        count += n
+        total += n * mean[0, 0]
+        total_sq += n * (std[0, 0] ** 2 + mean[0, 0] ** 2)
+    mean = total / count
+    var = total_sq / count - mean * mean
+    return beige >= PREWARPED_MIN_BEIGE_FRACTION * count and var < PREWARPED_MAX_BORDER_VAR
+
+
 def warp_to_top_down(image: np.ndarray, corners: np.ndarray, size: int = 1000) -> np.ndarray:
     dst_pts = np.float32([[0, 0], [size, 0], [size, size], [0, size]])
     src_pts = np.float32(corners)
@@ -167,61 +296,44 @@ def warp_to_top_down(image: np.ndarray, corners: np.ndarray, size: int = 1000) -
 
 def preprocess_image(img: np.ndarray) -> dict:
     resized = resize_if_needed(img)
-    corners = find_paper_corners(resized)
-    img_flat = warp_to_top_down(resized, corners) if corners is not None else resized
-
-    gray = cv2.cvtColor(img_flat, cv2.COLOR_BGR2GRAY)
-    blur = cv2.GaussianBlur(gray, (5, 5), 0)
+    # The per-pixel preprocessing chain runs through OpenCV's Transparent API
+    # so it lands on the OpenCL device when one is present. Results are
+    # downloaded once because the masking and contour code works on ndarrays.
+    src = cv2.UMat(resized) if USE_OPENCL else resized
+    corners = None if looks_prewarped(resized) else find_paper_corners(src)
+    img_flat = warp_to_top_down(src, corners) if corners is not None else src
+
+    # The bright fallback threshold and the adaptive sweep are tuned on luma,
+    # not on the HSV value channel: bright beige paper sits well under 240 in
+    # grayscale but above it as max(B, G, R).
+    blur = cv2.GaussianBlur(cv2.cvtColor(img_flat, cv2.COLOR_BGR2GRAY), (5, 5), 0)
     hsv = cv2.cvtColor(img_flat, cv2.COLOR_BGR2HSV)
 
     return {
-        "img": img_flat,
-        "gray": gray,
-        "blur": blur,
-        "hsv": hsv,
+        "img": to_host(img_flat),
+        "blur": to_host(blur),
+        "hsv": to_host(hsv),
         "corners": corners,
     }
 
 
 def build_marker_mask(hsv_img: np.ndarray) -> np.ndarray:
-    colour_masks = [
-        cv2.inRange(
-            hsv_img,
-            np.array(rule.hsv_lower, dtype=np.uint8),
-            np.array(rule.hsv_upper, dtype=np.uint8),
-        )
-        for rule in MARKER_COLOUR_RULES
-    ]
-    combined_marker_mask = stack_masks(colour_masks)
-
-    background_masks = [
-        cv2.inRange(
-            hsv_img,
-            np.array(rule.hsv_lower, dtype=np.uint8),
-            np.array(rule.hsv_upper, dtype=np.uint8),
-        )
-        for rule in BACKGROUND_SWATCHES
-    ]
-    combined_background_mask = stack_masks(background_masks)
-
-    # Remove the beige/dark ranges so coloured bench mats only register when the
-    # hue/value contrast is extreme (neon edge pressed over a hole).
-    clean_mask = cv2.bitwise_and(
-        combined_marker_mask, cv2.bitwise_not(combined_background_mask)
-    )
+    # Look up every pixel's per-channel rule bits, AND them so only rules
+    # matching on all three channels survive, then classify the bit pattern.
+    channel_bits = cv2.split(cv2.LUT(hsv_img, HSV_RULE_BITS_LUT))
+    rule_bits = cv2.bitwise_and(cv2.bitwise_and(channel_bits[0], channel_bits[1]), channel_bits[2])
+    clean_mask = cv2.LUT(rule_bits, RULE_BITS_TO_MASK_LUT)
 
     # Close tiny gaps inside rings/holes so we end up with solid contours even
     # when the marker is only a thin neon outline.
-    kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
-    clean_mask = cv2.morphologyEx(clean_mask, cv2.MORPH_CLOSE, kernel, iterations=1)
-    clean_mask = cv2.medianBlur(clean_mask, 3)
+    cv2.morphologyEx(clean_mask, cv2.MORPH_CLOSE, MASK_CLEANUP_KERNEL, dst=clean_mask, iterations=1)
+    cv2.medianBlur(clean_mask, 3, dst=clean_mask)
     return clean_mask
 
 
 def detect_target_center_and_scale(processed: dict) -> Tuple[float, float, float, float]:
-    gray = processed["gray"]
     blur = processed["blur"]
-    h, w = gray.shape[:2]
+    h, w = blur.shape[:2]
 
     circles = cv2.HoughCircles(
         blur,
@@ -240,8 +352,8 @@ def detect_target_center_and_scale(processed: dict) -> Tuple[float, float, float
         target_r = min(h, w) * 0.35
     else:
         circles = np.round(circles[0, :]).astype("int")
-        img_cx, img_cy = w / 2.0, h / 2.0
-        chosen = min(circles, key=lambda c: (c[0] - img_cx) ** 2 + (c[1] - img_cy) ** 2)
+        img_center = np.array([w / 2.0, h / 2.0])
+        chosen = circles[np.argmin(np.sum((circles[:, :2] - img_center) ** 2, axis=1))]
         cx, cy, target_r = float(chosen[0]), float(chosen[1]), float(chosen[2])
         log(f"Detected circle center=({cx:.1f},{cy:.1f}), r={target_r:.1f}")
 
@@ -259,7 +371,7 @@ def detect_target_geometry(processed: dict) -> dict:
     }
 
 
-def detect_shots(processed: dict, geom: dict) -> List[dict]:
+def detect_shots(processed: dict, geom: dict) -> np.ndarray:
     img = processed["img"]
     blur = processed["blur"]
     hsv = processed["hsv"]
@@ -268,7 +380,9 @@ def detect_shots(processed: dict, geom: dict) -> List[dict]:
     cy = geom["center_y"]
     target_r = geom["target_radius_px"]
 
-    combined_mask = build_marker_mask(hsv)
+    combined_mask = processed.get("marker_mask")
+    if combined_mask is None:
+        combined_mask = build_marker_mask(hsv)
 
     contours = []
     cnts, _ = cv2.findContours(combined_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
@@ -282,38 +396,56 @@ def detect_shots(processed: dict, geom: dict) -> List[dict]:
 
     if not contours:
         log("Colour mask failed; falling back to bright grayscale threshold")
-        for thr in [250, 245, 240]:
-            _, bright = cv2.threshold(blur, thr, 255, cv2.THRESH_BINARY)
-            cnts, _ = cv2.findContours(bright, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-            if len(cnts) >= 1:
-                contours = cnts
-                break
+        # The fallback filters run through the Transparent API on one shared
+        # upload of the blurred plane; only the final masks are downloaded,
+        # because contour tracing runs on the host.
+        blur_src = cv2.UMat(blur) if USE_OPENCL else blur
+        # A single pass at the lowest threshold finds a superset of the blobs
+        # the stricter thresholds would; the area filter below discards extras.
+        _, bright = cv2.threshold(blur_src, BRIGHT_FALLBACK_THRESHOLD, 255, cv2.THRESH_BINARY)
+        cnts, _ = cv2.findContours(to_host(bright), cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        if len(cnts) >= 1:
+            contours = cnts
 
     if not contours:
         log("Bright markers not found; searching for dark pellet holes with adaptive threshold")
-        for block_size in [11, 15, 21]:
+
+        def try_adaptive(block_size: int):
             dark = cv2.adaptiveThreshold(
-                blur,
+                blur_src,
                 255,
                 cv2.ADAPTIVE_THRESH_MEAN_C,
                 cv2.THRESH_BINARY_INV,
                 block_size,
                 5,
             )
-            dark = cv2.medianBlur(dark, 5)
-            cnts, _ = cv2.findContours(dark, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-            if len(cnts) >= 1:
-                contours = cnts
-                break
+            cv2.medianBlur(dark, 5, dst=dark)
+            cnts, _ = cv2.findContours(to_host(dark), cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+            return cnts
+
+        # The block sizes are independent and OpenCV releases the GIL, so run
+        # them concurrently but still prefer the smallest block that finds blobs.
+        # Each worker gets a share of OpenCV's pool so the concurrent calls do
+        # not all fan out across every core.
+        block_sizes = [11, 15, 21]
+        cores = os.cpu_count() or 1
+        with opencv_threads(cores // len(block_sizes)), ThreadPoolExecutor(
+            max_workers=len(block_sizes)
+        ) as pool:
+            for cnts in pool.map(try_adaptive, block_sizes):
+                if len(cnts) >= 1:
+                    contours = cnts
+                    break
 
     if not contours:
         log("No bright or dark blobs found for shots")
         contours = []
 
-    shots: List[dict] = []
+    accepted = []
 
     min_area = (target_r ** 2) * MIN_AREA_FACTOR
     max_area = (target_r ** 2) * MAX_AREA_FACTOR
+    max_dist_sq = (target_r * 1.5) ** 2
 
     if contours:
         log(
@@ -326,79 +458,62 @@ def detect_shots(processed: dict, geom: dict) -> List[dict]:
             continue
 
         (x, y), radius = cv2.minEnclosingCircle(cnt)
-        dist_center = np.hypot(x - cx, y - cy)
+        dist_center_sq = (x - cx) ** 2 + (y - cy) ** 2
 
-        if dist_center > target_r * 1.5:
+        if dist_center_sq > max_dist_sq:
             continue
 
-        shots.append({"x_px": float(x), "y_px": float(y), "contour_radius": float(radius)})
+        accepted.append((x, y, radius))
 
     processed["last_contours"] = contours
-    return shots
+    return np.array(accepted, dtype=SHOT_CANDIDATE_DTYPE)
 
 
-def compute_score_for_radius_mm(r_mm: float) -> float:
-    for score in range(10, 0, -1):
-        ring_r = ISSF_AIR_PISTOL_RING_RADII_MM[score]
-        if r_mm <= ring_r:
-            return float(score)
-    return 0.0
+def compute_scores_for_radii_mm(r_mm: np.ndarray) -> np.ndarray:
+    """Map an array of shot radii in mm to ISSF ring scores."""
+    return RING_SCORES[np.searchsorted(RING_RADII_ASC, r_mm, side="left")]
 
 
-def score_shots(shots: List[dict], geom: dict) -> List[dict]:
+def score_shots(shots: np.ndarray, geom: dict) -> np.ndarray:
     cx = geom["center_x"]
     cy = geom["center_y"]
     ppm = geom["pixels_per_mm"]
 
-    scored: List[dict] = []
-    target_r_px = ppm * MAX_RADIUS_MM
-
-    def clamp(v: float, lo: float = -1.5, hi: float = 1.5) -> float:
-        return max(lo, min(hi, v))
-
-    for shot in shots:
-        dx_px = shot["x_px"] - cx
-        dy_px = shot["y_px"] - cy
-
-        r_px = (dx_px ** 2 + dy_px ** 2) ** 0.5
-        r_mm = r_px / ppm if ppm else 0.0
-
-        score = compute_score_for_radius_mm(r_mm)
-
-        r_norm = r_mm / MAX_RADIUS_MM if MAX_RADIUS_MM else 0.0
-        x_norm = clamp((dx_px / ppm) / MAX_RADIUS_MM if ppm else 0.0)
-        # y_norm > 0 means "above center" (screen coordinates). We flip the
-        # image-space y because pixel coordinates grow downward.
-        y_norm = clamp((-dy_px / ppm) / MAX_RADIUS_MM if ppm else 0.0)
-
-        scored.append(
-            {
-                "x_px": shot["x_px"],
-                "y_px": shot["y_px"],
-                "x_norm": x_norm,
-                "y_norm": y_norm,
-                "r_mm": r_mm,
-                "score": score,
-                "target_radius_px": target_r_px,
-            }
-        )
-
-    scored.sort(key=lambda s: s.get("r_mm", 0.0))
-
     # Safety: if we detect a ridiculous number of blobs, treat this as failure.
     MAX_REASONABLE_SHOTS = 70
-    if len(scored) > MAX_REASONABLE_SHOTS:
-        log(f"Too many shots detected ({len(scored)}); treating as failure")
-        return []
+    if len(shots) > MAX_REASONABLE_SHOTS:
+        log(f"Too many shots detected ({len(shots)}); treating as failure")
+        return np.empty(0, dtype=SCORED_SHOT_DTYPE)
+
+    dx_px = shots["x_px"] - cx
+    dy_px = shots["y_px"] - cy
+
+    scored = np.empty(len(shots), dtype=SCORED_SHOT_DTYPE)
+    scored["x_px"] = shots["x_px"]
+    scored["y_px"] = shots["y_px"]
+    if ppm:
+        scored["r_mm"] = np.hypot(dx_px, dy_px) / ppm
+        scored["x_norm"] = np.clip((dx_px / ppm) / MAX_RADIUS_MM, -1.5, 1.5)
+        # y_norm > 0 means "above center" (screen coordinates). We flip the
+        # image-space y because pixel coordinates grow downward.
+        scored["y_norm"] = np.clip((-dy_px / ppm) / MAX_RADIUS_MM, -1.5, 1.5)
+    else:
+        scored["r_mm"] = scored["x_norm"] = scored["y_norm"] = 0.0
+    scored["score"] = compute_scores_for_radii_mm(scored["r_mm"])
 
-    return scored
+    return scored[np.argsort(scored["r_mm"], kind="stable")]
 
 
-def format_output(scored_shots: List[dict]) -> dict:
+def format_output(scored_shots: np.ndarray) -> dict:
+    # Records only become dicts here, at the JSON boundary.
     return {
         "shots": [
-            {"x": s.get("x_norm", 0.0), "y": s.get("y_norm", 0.0), "score": s.get("score", 0.0)}
-            for s in scored_shots
+            {"x": x, "y": y, "score": score}
+            for x, y, score in zip(
+                scored_shots["x_norm"].tolist(),
+                scored_shots["y_norm"].tolist(),
+                scored_shots["score"].tolist(),
+            )
         ],
         "count": len(scored_shots),
     }
@@ -421,7 +536,18 @@ def save_debug_image(
     Saved into uploads/debug as <original_name>_debug.jpg
     """
     try:
-        debug = img.copy()
+        # Draw on a copy already reduced to the output size; resizing yields
+        # the copy the drawing needs, so nothing is rendered at full size.
+        h, w = img.shape[:2]
+        scale = min(1.0, DEBUG_IMAGE_MAX_DIM / float(max(h, w)))
+        if scale < 1.0:
+            debug = cv2.resize(img, (int(w * scale), int(h * scale)))
+            contours = [np.round(c * scale).astype(np.int32) for c in contours]
+        else:
+            debug = img.copy()
+        cx *= scale
+        cy *= scale
+        target_r *= scale
 
         # 1) Draw detected / fallback target circle (green)
         cv2.circle(
@@ -439,11 +565,7 @@ def save_debug_image(
         # target_r here is the theoretical 1-ring radius in pixels
         # (pixels_per_mm * MAX_RADIUS_MM). This matches how we normalized
         # x_norm/y_norm.
-        for s in shots:
-            x_norm = s.get("x_norm")
-            y_norm = s.get("y_norm")
-            if x_norm is None or y_norm is None:
-                continue
+        for x_norm, y_norm in zip(shots["x_norm"].tolist(), shots["y_norm"].tolist()):
             x_px = int(cx + x_norm * target_r)
             y_px = int(cy + y_norm * target_r)
             cv2.circle(
@@ -468,6 +590,16 @@ def save_debug_image(
         log("Failed to save debug image:", e)
 
 
+def write_json(payload: dict) -> None:
+    """Write compact JSON to stdout for the Node caller in a single write.
+
+    The payload is encoded in full first, so an encoding error cannot leave a
+    partial object on stdout ahead of the error JSON.
+    """
+    sys.stdout.write(json.dumps(payload, separators=(",", ":")) + "\n")
+    sys.stdout.flush()
+
+
 def main():
     if len(sys.argv) < 2:
         print("Usage: detect_shots.py <image_path>", file=sys.stderr)
@@ -477,28 +609,41 @@ def main():
     try:
         raw_img = load_image(image_path)
         processed = preprocess_image(raw_img)
-        geom = detect_target_geometry(processed)
+        # The Hough target search and the colour mask read the same
+        # preprocessed planes but are otherwise independent, and both spend
+        # their time in GIL-releasing OpenCV code, so overlap them.
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            geom_future = pool.submit(detect_target_geometry, processed)
+            processed["marker_mask"] = build_marker_mask(processed["hsv"])
+            geom = geom_future.result()
         shot_candidates = detect_shots(processed, geom)
         scored_shots = score_shots(shot_candidates, geom)
 
-        save_debug_image(
-            img=processed["img"],
-            cx=geom["center_x"],
-            cy=geom["center_y"],
-            target_r=geom["pixels_per_mm"] * MAX_RADIUS_MM,
-            contours=processed.get("last_contours", []),
-            shots=scored_shots,
-            image_path=image_path,
-        )
+        # The debug render is not part of the JSON result, so encode/write it
+        # in the background while we print the measurements.
+        if SAVE_DEBUG_IMAGE:
+            DEBUG_IMAGE_EXECUTOR.submit(
+                save_debug_image,
+                img=processed["img"],
+                cx=geom["center_x"],
+                cy=geom["center_y"],
+                target_r=geom["pixels_per_mm"] * MAX_RADIUS_MM,
+                contours=processed.get("last_contours", []),
+                shots=scored_shots,
+                image_path=image_path,
+            )
 
         result = format_output(scored_shots)
         log(f"Returning {len(result['shots'])} detected shots")
-        print(json.dumps(result))
+        write_json(result)
     except Exception as e:
         log("Error in detect_shots:", e)
         # On error, still output a valid JSON so Node can decide to fallback
-        print(json.dumps({"shots": [], "error": str(e)}))
+        write_json({"shots": [], "error": str(e)})
         sys.exit(0)
+    finally:
+        # Node looks for the debug image once we exit, so it must be on disk.
+        DEBUG_IMAGE_EXECUTOR.shutdown(wait=True)
 
 
 if __name__ == "__main__":